@@ -1,20 +1,22 @@
 import streamlit as st
 import requests
-from datetime import datetime, time, timedelta
+from datetime import datetime
 import pytz
 import pandas as pd
+from sessions import session_calendar
+from constants import TIMEZONES, TZ_OBJECTS
 
 from streamlit_autorefresh import st_autorefresh
 
-# Auto-refresh every 15 seconds
-count = st_autorefresh(interval=3600 * 1000, limit=None, key="gold_autorefresh")
-
 # -------------------------------
 # App Config
 # -------------------------------
 st.set_page_config(page_title="XAU/USD Structure", layout="centered")
 st.title("📈 Gold (XAU/USD) HL Structure Calculator")
 
+# Auto-refresh every 15 seconds
+count = st_autorefresh(interval=3600 * 1000, limit=None, key="gold_autorefresh")
+
 # -------------------------------
 # Footer (your signature)
 # -------------------------------
@@ -128,24 +130,6 @@ def broken_logic(hh, prev_high, ll):
         "Supports": supports
     }, None
 
-# -------------------------------
-# Session definitions in UTC
-# -------------------------------
-SESSIONS_UTC = {
-    "Asia": {"start": time(0, 0), "end": time(9, 0)},       # 00:00 - 09:00 UTC
-    "London": {"start": time(7, 0), "end": time(16, 0)},   # 07:00 - 16:00 UTC
-    "New York": {"start": time(12, 0), "end": time(21, 0)} # 12:00 - 21:00 UTC
-}
-
-# -------------------------------
-# Timezone options
-# -------------------------------
-TIMEZONES = {
-    "Karachi (UTC+5)": "Asia/Karachi",
-    "London (UTC+1 BST)": "Europe/London",
-    "New York (UTC-4 EDT)": "America/New_York"
-}
-
 # -------------------------------
 # Utility: Format time to 12-hour in user tz
 # -------------------------------
@@ -157,12 +141,7 @@ def format_time(dt_utc, user_tz):
 # Detect current session based on UTC now
 # -------------------------------
 def get_current_session(now_utc):
-    for sess_name, times in SESSIONS_UTC.items():
-        start_dt = datetime.combine(now_utc.date(), times["start"], tzinfo=pytz.UTC)
-        end_dt = datetime.combine(now_utc.date(), times["end"], tzinfo=pytz.UTC)
-        # handle overnight session crossing midnight
-        if end_dt < start_dt:
-            end_dt += timedelta(days=1)
+    for sess_name, (start_dt, end_dt) in session_calendar(now_utc.date()).items():
         if start_dt <= now_utc < end_dt:
             return sess_name, start_dt, end_dt
     return "Closed", None, None
@@ -174,7 +153,7 @@ def get_current_session(now_utc):
 # Timezone selector
 st.sidebar.title("Settings")
 tz_name = st.sidebar.selectbox("Select Timezone", options=list(TIMEZONES.keys()), index=0)
-tz = pytz.timezone(TIMEZONES[tz_name])
+tz = TZ_OBJECTS[tz_name]
 
 # Get live gold price
 gold_data = get_gold_price()
@@ -224,13 +203,7 @@ current_session, sess_start_utc, sess_end_utc = get_current_session(now_utc)
 
 # Prepare session times data for display
 session_rows = []
-for sess_name, times in SESSIONS_UTC.items():
-    start_dt = datetime.combine(now_utc.date(), times["start"], tzinfo=pytz.UTC)
-    end_dt = datetime.combine(now_utc.date(), times["end"], tzinfo=pytz.UTC)
-    # Handle overnight sessions that cross midnight
-    if end_dt < start_dt:
-        end_dt += timedelta(days=1)
-
+for sess_name, (start_dt, end_dt) in session_calendar(now_utc.date()).items():
     session_rows.append({
         "Session": sess_name,
         "Start Time": format_time(start_dt, tz),
@@ -263,6 +236,18 @@ else:
     prev_high = st.number_input("Previous High", value=0.0, format="%.2f")
 
 hl_status = st.selectbox("HL Status", ["Buy", "Sell"])
+publish_snapshot = st.checkbox("Publish result as Arrow snapshot (for other tools)", value=False)
+
+@st.cache_resource
+def get_snapshot_writer():
+    from snapshot import SnapshotWriter
+    return SnapshotWriter("snapshots/gold_structure")
+
+def publish_result(source, result):
+    from snapshot import value_rows
+    inputs = {"HH": hh, "LL": ll, "Previous High": prev_high}
+    seq = get_snapshot_writer().publish(value_rows("XAUUSD", "inputs", inputs) + value_rows("XAUUSD", source, result))
+    st.caption(f"Snapshot #{seq} published.")
 
 # -------------------------------
 # Calculate Button
@@ -275,6 +260,8 @@ if st.button("🔍 Analyze"):
             st.error(error)
         else:
             st.success(f"📈 Market Trend: {result['Trend']}")
+            if publish_snapshot:
+                publish_result("swept", result)
             data = {
                 "Metric": [
                     "HL/IDM", "Dif2",
@@ -297,6 +284,8 @@ if st.button("🔍 Analyze"):
             st.error(error)
         else:
             st.success(f"📉 Market Trend: {result['Trend']}")
+            if publish_snapshot:
+                publish_result("broken", result)
             data = {
                 "Metric": [
                     "HL Break Zone",
@@ -0,0 +1,153 @@
+# alerts.py
+import logging
+import queue
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+import pytz
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+# -----------------------
+# Delivery sinks
+# -----------------------
+def webhook_sink(url, timeout=5):
+    def send(alert):
+        payload = dict(alert, time=alert["time"].isoformat())
+        try:
+            requests.post(url, json=payload, timeout=timeout)
+        except requests.RequestException as e:
+            logger.warning("Alert webhook failed: %s", e)
+    return send
+
+
+# -----------------------
+# Level alert engine
+# -----------------------
+class LevelAlertEngine:
+    # Per symbol, level prices live in one sorted list so the levels crossed between
+    # two consecutive prices are a bisect range query: cost grows with crossings, not
+    # with the number of levels. After a level fires it is disarmed until price leaves
+    # the +/- hysteresis band around it; the band edges are kept in a second sorted
+    # list so re-arming is a range query too.
+
+    def __init__(self, hysteresis=0.0, sinks=None):
+        self.hysteresis = hysteresis
+        self.queue = queue.Queue()
+        self.sinks = list(sinks) if sinks else [self.queue.put]
+        self._prices = {}      # symbol -> sorted level prices
+        self._names = {}       # symbol -> level names aligned with _prices
+        self._band = {}        # symbol -> hysteresis in price units
+        self._edges = {}       # symbol -> sorted band-edge prices
+        self._edge_names = {}  # symbol -> level names aligned with _edges
+        self._disarmed = {}    # symbol -> {name: (lower_edge, upper_edge)}
+        self._last = {}        # symbol -> last seen price
+
+    def set_levels(self, symbol, levels, hysteresis=None):
+        pairs = sorted((float(v), k) for k, v in levels.items() if v is not None)
+        self._prices[symbol] = [p for p, _ in pairs]
+        self._names[symbol] = [k for _, k in pairs]
+        self._band[symbol] = self.hysteresis if hysteresis is None else hysteresis
+        self._edges.setdefault(symbol, [])
+        self._edge_names.setdefault(symbol, [])
+        self._disarmed.setdefault(symbol, {})
+        # levels that disappeared cannot be re-armed any more
+        names = set(self._names[symbol])
+        for name in [n for n in self._disarmed[symbol] if n not in names]:
+            self._arm(symbol, name)
+
+    def levels(self, symbol):
+        return dict(zip(self._names.get(symbol, []), self._prices.get(symbol, [])))
+
+    @staticmethod
+    def _crossed(prices, prev, price):
+        # half-open so a price resting exactly on a level does not fire twice
+        if price > prev:
+            return bisect_right(prices, prev), bisect_right(prices, price)
+        return bisect_left(prices, price), bisect_left(prices, prev)
+
+    def _arm(self, symbol, name):
+        edges = self._disarmed[symbol].pop(name, None)
+        if edges is None:
+            return
+        prices = self._edges[symbol]
+        names = self._edge_names[symbol]
+        for edge in edges:
+            i = bisect_left(prices, edge)
+            while i < len(prices) and prices[i] == edge:
+                if names[i] == name:
+                    del prices[i]
+                    del names[i]
+                    break
+                i += 1
+
+    def _disarm(self, symbol, name, level_price, price):
+        band = self._band[symbol]
+        if band <= 0 or abs(price - level_price) >= band:
+            return
+        edges = (level_price - band, level_price + band)
+        self._disarmed[symbol][name] = edges
+        prices = self._edges[symbol]
+        names = self._edge_names[symbol]
+        for edge in edges:
+            i = bisect_right(prices, edge)
+            prices.insert(i, edge)
+            names.insert(i, name)
+
+    def on_tick(self, symbol, price, when=None):
+        prices = self._prices.get(symbol)
+        prev = self._last.get(symbol)
+        self._last[symbol] = price
+        if prices is None or prev is None or price == prev:
+            return []
+
+        # re-arm levels whose hysteresis band was left on this move
+        edges = self._edges[symbol]
+        if edges:
+            i, j = self._crossed(edges, prev, price)
+            for name in self._edge_names[symbol][i:j]:
+                self._arm(symbol, name)
+
+        i, j = self._crossed(prices, prev, price)
+        if i == j:
+            return []
+        direction = "up" if price > prev else "down"
+        when = when or datetime.now(pytz.UTC)
+        disarmed = self._disarmed[symbol]
+        names = self._names[symbol]
+        fired = []
+        for k in range(i, j):
+            name = names[k]
+            if name in disarmed:
+                continue
+            alert = {
+                "symbol": symbol,
+                "level": name,
+                "level_price": prices[k],
+                "price": price,
+                "direction": direction,
+                "time": when,
+            }
+            fired.append(alert)
+            self._disarm(symbol, name, prices[k], price)
+        for alert in fired:
+            for sink in self.sinks:
+                sink(alert)
+        return fired
+
+    def on_ticks(self, symbol, prices, times=None):
+        fired = []
+        for k, price in enumerate(prices):
+            fired.extend(self.on_tick(symbol, float(price), None if times is None else times[k]))
+        return fired
+
+    def drain(self, max_items=None):
+        alerts = []
+        while max_items is None or len(alerts) < max_items:
+            try:
+                alerts.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return alerts
@@ -1,33 +1,53 @@
 # streamlit_mt5_dashboard.py
+import time
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
 import MetaTrader5 as mt5
-from datetime import datetime
-import pytz
-import plotly.graph_objects as go
 from streamlit_autorefresh import st_autorefresh
-import time
+from constants import KARACHI_TZ, SERVER_TIMEZONES, TIMEFRAME_LABELS, timeframe_map
+from levels import compute_levels, rate_times
+from portfolio import PositionBook
+from journal import TradeJournal
+from order_queue import OrderExecutor
+from sessions import SESSION_NAMES, SessionTracker, latest_session_rates, offset_from_clock
+# plotly, the tick recorder and the alert engine are imported on first use
 
 # -----------------------
-# Initialize MT5
+# Page config & header (first paint before MT5 is touched)
 # -----------------------
-if not mt5.initialize():
-    st.error("❌ MT5 initialization failed. Make sure MetaTrader5 terminal is running and logged in.")
-    st.stop()
-
-tz = pytz.timezone("Asia/Karachi")
+st.set_page_config(page_title="MT5 Dashboard (Tabs per Symbol)", layout="wide")
+st.title("📊 MT5 Dashboard — Tabs per Symbol")
 
 # -----------------------
-# Page config & header
+# Initialize MT5 (once per process, not on every rerun)
 # -----------------------
-st.set_page_config(page_title="MT5 Dashboard (Tabs per Symbol)", layout="wide")
-st.title("📊 MT5 Dashboard — Tabs per Symbol")
+@st.cache_resource
+def init_mt5():
+    return mt5.initialize()
+
+# terminal_info() is None once the terminal restarted or the IPC link dropped; the cached
+# initialize() result is stale then, so connect again
+if init_mt5() and mt5.terminal_info() is None:
+    init_mt5.clear()
+if not init_mt5():
+    init_mt5.clear()
+    st.error("❌ MT5 initialization failed. Make sure MetaTrader5 terminal is running and logged in.")
+    st.stop()
+
+tz = KARACHI_TZ
 
 # -----------------------
 # Fetch available symbols
 # -----------------------
-all_symbols = [s.name for s in mt5.symbols_get()]
+@st.cache_data(ttl=60)
+def get_all_symbols():
+    symbols = mt5.symbols_get()
+    return [s.name for s in symbols] if symbols else []
+
+all_symbols = get_all_symbols()
 if not all_symbols:
+    get_all_symbols.clear()
     st.error("⚠️ No symbols returned from MT5. Check the terminal and Market Watch.")
     st.stop()
 
@@ -40,6 +60,12 @@ with st.sidebar:
     lot_size = st.number_input("Default Lot Size", min_value=0.01, step=0.01, value=0.1)
     default_sl_points = st.number_input("Default SL (points, 0 = no SL)", min_value=0, value=0, step=1)
     default_tp_points = st.number_input("Default TP (points, 0 = auto from levels)", min_value=0, value=0, step=1)
+    record_ticks = st.checkbox("Record ticks (memory-mapped ring + Parquet)", value=False)
+    stream_charts = st.checkbox("Stream charts (push only changes over a local WebSocket)", value=False)
+    stream_interval_ms = st.number_input("Chart stream interval (ms)", min_value=100, max_value=5000, value=500, step=100)
+    publish_snapshots = st.checkbox("Publish levels & signals as Arrow snapshots", value=False)
+    alerts_enabled = st.checkbox("Alert when price touches a level", value=False)
+    alert_hysteresis_points = st.number_input("Alert hysteresis (points)", min_value=0, value=50, step=1)
     st.markdown("---")
     st.write("Symbols are loaded from your MT5 terminal (Market Watch).")
     st.write("Test with demo account. Auto-trade will place live orders when enabled.")
@@ -47,25 +73,37 @@ with st.sidebar:
 # controls on top area
 col1, col2 = st.columns([2, 1])
 with col1:
-    timeframe_map = {
-        "1 Minute": mt5.TIMEFRAME_M1,
-        "5 Minutes": mt5.TIMEFRAME_M5,
-        "15 Minutes": mt5.TIMEFRAME_M15,
-        "1 Hour": mt5.TIMEFRAME_H1,
-        "4 Hours": mt5.TIMEFRAME_H4,
-        "1 Day": mt5.TIMEFRAME_D1
-    }
-    timeframe_choice = st.selectbox("Timeframe", list(timeframe_map.keys()), index=0)
-    timeframe = timeframe_map[timeframe_choice]
+    timeframe_choice = st.selectbox("Timeframe", TIMEFRAME_LABELS, index=0)
+    timeframe = timeframe_map()[timeframe_choice]
 
     num_candles = st.slider("Number of candles to fetch", 50, 800, 200)
+    level_source = st.selectbox("Compute levels from", ["All candles"] + [f"{name} session" for name in SESSION_NAMES], index=0)
+    session_filter = None if level_source == "All candles" else level_source[:-len(" session")]
+    server_tz_choice = st.selectbox("Broker server time zone", list(SERVER_TIMEZONES), index=0)
     selected_symbols = st.multiselect("Select symbols to analyze (choose from MT5 Market Watch)", options=all_symbols,
                                       default=[s for s in ["XAUUSDm", "USTECm", "BTCUSDm"] if s in all_symbols])
+    server_tz = SERVER_TIMEZONES[server_tz_choice]
+    if server_tz is None:
+        # tick.time is on the server clock, so a fresh tick gives the current offset (DST included)
+        now = time.time()
+        ticks = (mt5.symbol_info_tick(s) for s in selected_symbols)
+        derived = next((o for o in (offset_from_clock(t.time, now) for t in ticks if t) if o is not None), None)
+        if derived is not None:
+            st.session_state.server_offset = derived
+        server_tz = st.session_state.get("server_offset")
+        if server_tz is None:
+            st.warning("Could not derive the broker server offset (no fresh tick); using UTC. Pick the server time zone above.")
+            server_tz = 0
+        else:
+            st.caption(f"Broker server clock: UTC{server_tz / 3600:+g}" + ("" if derived is not None else " (last known)"))
 with col2:
-    # show total open positions count
-    positions_all = mt5.positions_get()
-    total_open = len(positions_all) if positions_all is not None else 0
-    st.metric("Open Positions (total)", total_open)
+    # one positions_get() per refresh; the book applies only opened/closed/modified tickets
+    if "position_book" not in st.session_state:
+        st.session_state.position_book = PositionBook()
+    position_book = st.session_state.position_book
+    position_book.sync(mt5.positions_get())
+    st.metric("Open Positions (total)", len(position_book),
+              delta=f"{position_book.floating_profit:.2f} floating P&L", delta_color="off")
 
 # autorefresh
 st_autorefresh(interval=refresh_seconds * 1000, key="auto_refresher")
@@ -73,61 +111,74 @@ st_autorefresh(interval=refresh_seconds * 1000, key="auto_refresher")
 # -----------------------
 # Helper functions
 # -----------------------
+@st.cache_resource
+def get_tick_recorder():
+    from tick_recorder import TickRecorder
+    return TickRecorder("ticks")
+
+@st.cache_resource
+def get_chart_stream():
+    from chart_stream import ChartStreamServer
+    return ChartStreamServer(port=8765)
+
+@st.cache_resource
+def get_snapshot_writer():
+    from snapshot import SnapshotWriter
+    return SnapshotWriter("snapshots/mt5_dashboard")
+
+def candlestick_chart(symbol, rates, levels, last_price, title):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=[go.Candlestick(
+        x=rate_times(rates), open=rates["open"], high=rates["high"], low=rates["low"], close=rates["close"],
+        name=symbol
+    )])
+    # draw buy/sell/resistance lines
+    for lvl_name in ["Buy1","Buy2","Buy3"]:
+        fig.add_hline(y=levels[lvl_name], line=dict(color="green", dash="dash"), annotation_text=lvl_name, annotation_position="top left")
+    for lvl_name in ["Resistance1","Resistance2","Resistance3"]:
+        fig.add_hline(y=levels[lvl_name], line=dict(color="orange", dash="dot"), annotation_text=lvl_name, annotation_position="top right")
+    if levels["Sell1"] is not None:
+        fig.add_hline(y=levels["Sell1"], line=dict(color="red", dash="dash"), annotation_text="Sell1", annotation_position="bottom left")
+    fig.add_hline(y=last_price, line=dict(color="blue", width=2), annotation_text="Last Price", annotation_position="bottom right")
+    fig.update_layout(title=title, xaxis_rangeslider_visible=False, height=520)
+    return fig
+
+@st.cache_resource
+def get_trade_journal():
+    return TradeJournal("journal.db")
+
+def _journal_fill(status):
+    # runs on the order worker thread once an order settles
+    if status["state"] == "filled" and status["intent"] and status["order"]:
+        level_name, level_price = status["intent"]
+        get_trade_journal().record_intent(status["order"], status["symbol"], status["side"], level_name, level_price)
+
+@st.cache_resource
+def get_order_executor():
+    return OrderExecutor(max_in_flight=1, on_done=_journal_fill)
+
 def safe_symbol_info(symbol):
     info = mt5.symbol_info(symbol)
     return info
 
-def analyze_symbol(symbol, timeframe, num_candles):
+def analyze_symbol(symbol, timeframe, num_candles, session=None, server_tz=None):
     rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, num_candles)
     if rates is None or len(rates) == 0:
         return None, None
-    df = pd.DataFrame(rates)
-    df["time"] = pd.to_datetime(df["time"], unit="s")
-
-    HH = df["high"].max()
-    LL = df["low"].min()
-    HL = df["low"].max()
-    sorted_highs = df["high"].sort_values(ascending=False).values
-    sorted_lows = df["low"].sort_values().values
-    PHH = sorted_highs[1] if len(sorted_highs) > 1 else None
-    PLL = sorted_lows[1] if len(sorted_lows) > 1 else None
-    RLL = sorted_lows[0] if len(sorted_lows) > 0 else None
-
-    # buy/sell logic used previously
-    dif = HH - LL
-    idm = dif / 2
-    factor = 1.4
-    Buy1 = HH - (factor * idm)
-    Buy2 = Buy1 - (factor * idm)
-    Buy3 = Buy2 - (factor * idm)
-    Resistance1 = HH + (factor * idm)
-    Resistance2 = Resistance1 + (factor * idm)
-    Resistance3 = Resistance2 + (factor * idm)
-
-    # Sell levels (if PLL and RLL exist)
-    if (PLL is not None) and (RLL is not None):
-        dif_sell = PLL - RLL
-        Sell1 = HH + dif_sell
-        Sell2 = Sell1 + dif_sell
-        Sell3 = Sell2 + dif_sell
-    else:
-        Sell1 = Sell2 = Sell3 = None
-
-    levels = {
-        "HH": HH, "LL": LL, "HL": HL, "PHH": PHH, "PLL": PLL, "RLL": RLL,
-        "Buy1": Buy1, "Buy2": Buy2, "Buy3": Buy3,
-        "Resistance1": Resistance1, "Resistance2": Resistance2, "Resistance3": Resistance3,
-        "Sell1": Sell1, "Sell2": Sell2, "Sell3": Sell3
-    }
-    return levels, df
+    # levels come straight from the structured array; no DataFrame per symbol
+    level_rates = rates
+    if session is not None:
+        # e.g. Asian range / London session only: latest occurrence of that session
+        level_rates = latest_session_rates(rates, session, server_tz)
+        if len(level_rates) == 0:
+            return None, rates
+    levels = compute_levels(level_rates)
+    return levels, rates
 
 def get_positions_df():
-    positions = mt5.positions_get()
-    if not positions:
-        return pd.DataFrame()
-    pos_list = [p._asdict() for p in positions]
-    df_pos = pd.DataFrame(pos_list)
-    return df_pos
+    # served from the position book synced at the top of the page
+    return position_book.positions_frame()
 
 def get_positions_for_symbol(symbol):
     df_pos = get_positions_df()
@@ -169,41 +220,19 @@ def estimate_profit_usd(symbol, tp_points, lot):
     # approximate: profit = tp_points * tick_value * lots
     return tp_points * tick_value * lot
 
-def place_order_safe(symbol, lot, order_type, sl_points=0, tp_price=None):
-    info = mt5.symbol_info(symbol)
-    if not info:
-        st.error("Symbol info not available.")
-        return None
-    
-    # Safe check for trade permission
-    trade_allowed = getattr(info, "trade_allowed", True)  # fallback to True if attribute missing
-    if not trade_allowed:
-        st.warning(f"Trading not allowed for {symbol}.")
-        return None
-
-    tick = mt5.symbol_info_tick(symbol)
-    price = tick.ask if order_type == "BUY" else tick.bid
-
-    sl = 0.0
-    if sl_points and sl_points > 0:
-        sl = 0.0
-
-    request = {
-        "action": mt5.TRADE_ACTION_DEAL,
-        "symbol": symbol,
-        "volume": lot,
-        "type": mt5.ORDER_TYPE_BUY if order_type == "BUY" else mt5.ORDER_TYPE_SELL,
-        "price": price,
-        "sl": sl,
-        "tp": tp_price if tp_price is not None else 0.0,
-        "deviation": 20,
-        "magic": 123456,
-        "comment": f"Streamlit Auto {order_type}",
-        "type_time": mt5.ORDER_TIME_GTC,
-        "type_filling": mt5.ORDER_FILLING_IOC
-    }
-    result = mt5.order_send(request)
-    return result
+def place_order_safe(symbol, lot, order_type, sl_points=0, tp_price=None, intent=None):
+    # queued for the order worker; returns an order id whose status shows up in "Order Queue"
+    order_id = get_order_executor().submit(symbol, lot, order_type, sl_points, tp_price, intent)
+    st.session_state.order_ids.append(order_id)
+    return order_id
+
+def show_order_status(order_id):
+    # submit() may already have rejected the order (in-flight limit)
+    status = get_order_executor().statuses([order_id])[0]
+    if status["state"] == "rejected":
+        st.warning(f"Order #{order_id} rejected: {status['message']}")
+    else:
+        st.write(f"Order #{order_id} {status['state']}.")
 
 
 # -----------------------
@@ -213,12 +242,28 @@ if "last_trade" not in st.session_state:
     st.session_state.last_trade = {}  # symbol -> "BUY"/"SELL"/None
 if "autotrade" not in st.session_state:
     st.session_state.autotrade = {}  # symbol -> bool
+if "order_ids" not in st.session_state:
+    st.session_state.order_ids = []  # orders submitted from this session
+if alerts_enabled and "alert_engine" not in st.session_state:
+    from alerts import LevelAlertEngine
+    st.session_state.alert_engine = LevelAlertEngine()
+    st.session_state.alert_log = []  # newest first
+    st.session_state.alert_cursor = {}  # symbol -> ring write position already fed to the engine
 
 # initialize default states for selected symbols
 for s in selected_symbols:
     st.session_state.last_trade.setdefault(s, None)
     st.session_state.autotrade.setdefault(s, False)
 
+# -----------------------
+# Tick recording (selected symbols only)
+# -----------------------
+if record_ticks and selected_symbols:
+    get_tick_recorder().poll(selected_symbols)
+
+# (symbol, source, values) collected during this refresh for the snapshot export
+snapshot_values = []
+
 # -----------------------
 # Tabs per symbol
 # -----------------------
@@ -232,31 +277,52 @@ else:
             st.header(f"{symbol}")
 
             # analyze
-            levels, df = analyze_symbol(symbol, timeframe, num_candles)
+            levels, rates = analyze_symbol(symbol, timeframe, num_candles, session_filter, server_tz)
             if levels is None:
-                st.warning("No candle data for this symbol (open in Market Watch & try again).")
+                if rates is not None:
+                    st.warning(f"No {session_filter} session candles in the fetched range (fetch more candles).")
+                else:
+                    st.warning("No candle data for this symbol (open in Market Watch & try again).")
                 continue
 
-            last_price = float(df["close"].iloc[-1])
+            # per-session open/HH/LL, updated with new candles only
+            tracker_key = (symbol, timeframe, server_tz)
+            trackers = st.session_state.setdefault("session_trackers", {})
+            if tracker_key not in trackers:
+                trackers[tracker_key] = SessionTracker(server_tz)
+            trackers[tracker_key].update(rates)
+            session_ranges = [trackers[tracker_key].latest(name) for name in SESSION_NAMES]
+            st.caption(" | ".join(
+                f"{r['session']}: O {r['open']:.5f} HH {r['HH']:.5f} LL {r['LL']:.5f}"
+                for r in session_ranges if r is not None
+            ))
+
+            last_price = float(rates["close"][-1])
+
+            if record_ticks:
+                ring = get_tick_recorder().ring(symbol)
+                recent_ticks = ring.recent(1)
+                if len(recent_ticks):
+                    spread = float(recent_ticks["ask"][-1] - recent_ticks["bid"][-1])
+                    st.caption(f"Recorded ticks: {ring.written} (ring holds {len(ring)}) | spread {spread:.5f}")
 
             # chart
-            fig = go.Figure(data=[go.Candlestick(
-                x=df["time"], open=df["open"], high=df["high"], low=df["low"], close=df["close"],
-                name=symbol
-            )])
-            # draw buy/sell/resistance lines
-            for lvl_name in ["Buy1","Buy2","Buy3"]:
-                fig.add_hline(y=levels[lvl_name], line=dict(color="green", dash="dash"), annotation_text=lvl_name, annotation_position="top left")
-            for lvl_name in ["Resistance1","Resistance2","Resistance3"]:
-                fig.add_hline(y=levels[lvl_name], line=dict(color="orange", dash="dot"), annotation_text=lvl_name, annotation_position="top right")
-            if levels["Sell1"] is not None:
-                fig.add_hline(y=levels["Sell1"], line=dict(color="red", dash="dash"), annotation_text="Sell1", annotation_position="bottom left")
-            fig.add_hline(y=last_price, line=dict(color="blue", width=2), annotation_text="Last Price", annotation_position="bottom right")
-            fig.update_layout(title=f"{symbol} — {timeframe_choice}", xaxis_rangeslider_visible=False, height=520)
-            st.plotly_chart(fig, use_container_width=True, key=f"chart_{symbol}_{i}")
+            chart_title = f"{symbol} — {timeframe_choice}"
+            if stream_charts:
+                # the iframe markup is identical on every rerun, so the browser keeps it and
+                # only receives candle / last-price / level deltas from the stream server
+                from chart_stream import stream_chart_html
+                chart_stream = get_chart_stream()
+                chart_stream.interval = stream_interval_ms / 1000
+                chart_stream.watch(symbol, timeframe, num_candles, levels)
+                components.html(stream_chart_html(symbol, timeframe, chart_title, port=chart_stream.port), height=540)
+            else:
+                fig = candlestick_chart(symbol, rates, levels, last_price, chart_title)
+                st.plotly_chart(fig, use_container_width=True, key=f"chart_{symbol}_{i}")
 
             # calculation table
             st.subheader("Calculation Table")
+            snapshot_values.append((symbol, "levels", levels))
             calc_df = pd.DataFrame({k: [v] for k, v in levels.items()})
             st.dataframe(calc_df.style.format(precision=5), use_container_width=True)
 
@@ -277,6 +343,21 @@ else:
                 point = 1.0
                 pip = 1.0
 
+            # level alerts: feed every recorded tick when available, else the last price
+            if alerts_enabled:
+                engine = st.session_state.alert_engine
+                engine.set_levels(symbol, levels, hysteresis=alert_hysteresis_points * point)
+                if record_ticks:
+                    ring = get_tick_recorder().ring(symbol)
+                    # a new session starts at the head of the ring instead of replaying its history
+                    cursor = st.session_state.alert_cursor.setdefault(symbol, ring.written)
+                    new_ticks, st.session_state.alert_cursor[symbol] = ring.after(cursor)
+                    if len(new_ticks):
+                        tick_times = pd.to_datetime(new_ticks["time_msc"], unit="ms", utc=True)
+                        engine.on_ticks(symbol, new_ticks["bid"], tick_times)
+                else:
+                    engine.on_tick(symbol, last_price)
+
             # Choose TP source: auto from levels (Resistance1 - Buy1) or manual
             # Compute suggested TP for BUY: use Resistance1 - Buy1 (in points)
             suggested_tp_points = None
@@ -309,13 +390,13 @@ else:
                     tp_points_use = int(suggested_tp_points) if suggested_tp_points and suggested_tp_points > 0 else int(default_tp_points or 50)
                     tp_price = last_price + tp_points_use * point
                     res = place_order_safe(symbol, lot_size, "BUY", default_sl_points, tp_price)
-                    st.write("Order result:", res)
+                    show_order_status(res)
 
                 if st.button(f"Place SELL {symbol}", key=f"manual_sell_{symbol}"):
                     tp_points_use = int(suggested_tp_points) if suggested_tp_points and suggested_tp_points > 0 else int(default_tp_points or 50)
                     tp_price = last_price - tp_points_use * point
                     res = place_order_safe(symbol, lot_size, "SELL", default_sl_points, tp_price)
-                    st.write("Order result:", res)
+                    show_order_status(res)
 
             with colC:
                 last_trade = st.session_state.last_trade.get(symbol)
@@ -344,8 +425,9 @@ else:
                         if st.session_state.last_trade.get(symbol) != "BUY":
                             tp_points_use = int(suggested_tp_points) if suggested_tp_points and suggested_tp_points > 0 else int(default_tp_points or 50)
                             tp_price = last_price + tp_points_use * point
-                            result = place_order_safe(symbol, lot_size, "BUY", default_sl_points, tp_price)
+                            place_order_safe(symbol, lot_size, "BUY", default_sl_points, tp_price, intent=("Buy1", buy_level))
                             st.session_state.last_trade[symbol] = f"BUY @{last_price:.5f} TP={tp_points_use} pts"
+                            snapshot_values.append((symbol, "signal", {"BUY": last_price, "Level": "Buy1"}))
                             triggered = True
 
                 # SELL cross
@@ -354,13 +436,48 @@ else:
                         if st.session_state.last_trade.get(symbol) != "SELL":
                             tp_points_use = int(suggested_tp_points) if suggested_tp_points and suggested_tp_points > 0 else int(default_tp_points or 50)
                             tp_price = last_price - tp_points_use * point
-                            result = place_order_safe(symbol, lot_size, "SELL", default_sl_points, tp_price)
+                            place_order_safe(symbol, lot_size, "SELL", default_sl_points, tp_price, intent=("Sell1", sell_level))
                             st.session_state.last_trade[symbol] = f"SELL @{last_price:.5f} TP={tp_points_use} pts"
+                            snapshot_values.append((symbol, "signal", {"SELL": last_price, "Level": "Sell1"}))
                             triggered = True
 
                 # update prev_price for next refresh
                 st.session_state[previous_state_key] = last_price
 
+# -----------------------
+# Snapshot export (one Arrow IPC file per refresh, monotonic sequence number)
+# -----------------------
+if publish_snapshots and snapshot_values:
+    from snapshot import value_rows
+    snapshot_rows = [row for sym, source, values in snapshot_values for row in value_rows(sym, source, values)]
+    snapshot_seq = get_snapshot_writer().publish(snapshot_rows)
+    st.sidebar.caption(f"Snapshot #{snapshot_seq} published ({len(snapshot_rows)} rows).")
+
+# -----------------------
+# Order queue status (updated by the order worker between refreshes)
+# -----------------------
+if st.session_state.order_ids:
+    st.markdown("---")
+    st.subheader("Order Queue")
+    order_rows = get_order_executor().statuses(st.session_state.order_ids)
+    df_orders = pd.DataFrame(order_rows).drop(columns=["intent", "queued_at"])
+    st.dataframe(df_orders.style.format(precision=2), use_container_width=True)
+
+# -----------------------
+# Level alerts (drained from the engine queue)
+# -----------------------
+if alerts_enabled:
+    st.markdown("---")
+    st.subheader("Level Alerts")
+    new_alerts = st.session_state.alert_engine.drain()
+    st.session_state.alert_log = (new_alerts[::-1] + st.session_state.alert_log)[:200]
+    if not st.session_state.alert_log:
+        st.info("No level touched yet.")
+    else:
+        df_alerts = pd.DataFrame(st.session_state.alert_log)
+        df_alerts["time"] = df_alerts["time"].dt.tz_convert(tz).dt.strftime("%H:%M:%S")
+        st.dataframe(df_alerts.style.format(precision=5, subset=["level_price", "price"]), use_container_width=True)
+
 # -----------------------
 # Bottom: Global open positions (safe display of available columns)
 # -----------------------
@@ -371,6 +488,13 @@ df_pos_all = get_positions_df()
 if df_pos_all.empty:
     st.info("No open positions.")
 else:
+    colS, colM = st.columns([1, 1])
+    with colS:
+        st.write("Exposure by symbol")
+        st.dataframe(position_book.symbol_frame().style.format(precision=2), use_container_width=True)
+    with colM:
+        st.write("Exposure by magic number (dashboard orders use 123456)")
+        st.dataframe(position_book.magic_frame().style.format(precision=2), use_container_width=True)
     st.write("Available position columns:", df_pos_all.columns.tolist())
     cols_to_show = [c for c in ["ticket","symbol","volume","type","price_open","sl","tp","price_current","profit"] if c in df_pos_all.columns]
     df_show = df_pos_all[cols_to_show].copy()
@@ -378,6 +502,26 @@ else:
         df_show["type"] = df_show["type"].map({0:"BUY",1:"SELL"}).fillna(df_show["type"])
     st.dataframe(df_show.style.format(precision=2), use_container_width=True)
 
+# -----------------------
+# Trade journal (incremental sync from MT5 deal history)
+# -----------------------
+st.markdown("---")
+st.subheader("Trade Journal (dashboard orders, magic 123456)")
+
+journal = get_trade_journal()
+journal.sync()
+df_journal = journal.stats(magic=123456)
+if df_journal.empty:
+    st.info("No dashboard trades in the account history yet.")
+else:
+    colJ1, colJ2, colJ3 = st.columns([1, 1, 1])
+    colJ1.metric("Realised P&L", f"{df_journal['realised_pnl'].sum():.2f}")
+    closed_total = df_journal["closed_trades"].sum()
+    win_rate = (df_journal["win_rate"] * df_journal["closed_trades"]).sum() / closed_total if closed_total else None
+    colJ2.metric("Win rate", f"{win_rate:.0%}" if win_rate is not None else "N/A")
+    colJ3.metric("Avg slippage vs level", f"{df_journal['avg_slippage'].mean():.5f}" if df_journal["avg_slippage"].notna().any() else "N/A")
+    st.dataframe(df_journal.style.format(precision=5), use_container_width=True)
+
 # -----------------------
 # Footer
 # -----------------------
@@ -0,0 +1,231 @@
+# chart_stream.py
+import asyncio
+import json
+import logging
+import threading
+
+import MetaTrader5 as mt5
+from websockets.asyncio.server import broadcast, serve
+
+logger = logging.getLogger(__name__)
+
+CANDLE_FIELDS = ("time", "open", "high", "low", "close")
+
+
+def _candles(rates):
+    return {f: rates[f].tolist() for f in CANDLE_FIELDS}
+
+
+def _clean_levels(levels):
+    return {k: float(v) for k, v in levels.items() if v is not None}
+
+
+# -----------------------
+# Local WebSocket server pushing chart deltas
+# -----------------------
+class ChartStreamServer:
+    # The browser gets one snapshot when it subscribes to a (symbol, timeframe); after that the
+    # server polls MT5 every `interval` seconds and sends only what changed: the
+    # forming/new candles, the last price and level lines that moved. Streamlit
+    # reruns only call watch() and never re-send the chart; a changed candle count
+    # pushes a fresh snapshot to the open charts instead.
+
+    def __init__(self, host="127.0.0.1", port=8765, interval=0.5):
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self._watch = {}     # (symbol, timeframe) -> {"count", "levels"}
+        self._sent = {}      # (symbol, timeframe) -> {"time", "candle", "last", "levels"} last pushed state
+        self._clients = {}   # websocket -> subscribed (symbol, timeframe)
+        self._resnap = set() # keys whose candle count changed since the last poll
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="chart-stream", daemon=True)
+        self._thread.start()
+
+    def watch(self, symbol, timeframe, count, levels):
+        with self._lock:
+            key = (symbol, timeframe)
+            old = self._watch.get(key)
+            if old is not None and old["count"] != count:
+                self._resnap.add(key)
+            self._watch[key] = {"count": count, "levels": _clean_levels(levels)}
+
+    def _run(self):
+        try:
+            asyncio.run(self._main())
+        except OSError as e:
+            logger.warning("Chart stream server could not start on %s:%s: %s", self.host, self.port, e)
+
+    async def _main(self):
+        async with serve(self._handler, self.host, self.port):
+            while True:
+                await asyncio.sleep(self.interval)
+                self._poll()
+
+    async def _handler(self, websocket):
+        try:
+            async for message in websocket:
+                request = json.loads(message)
+                key = (request.get("subscribe"), request.get("timeframe"))
+                if not key[0]:
+                    continue
+                # drop the old subscription first so the snapshot below resets the push state
+                self._clients.pop(websocket, None)
+                snapshot = self._snapshot(key)
+                if snapshot is None:
+                    await websocket.send(json.dumps({"type": "error", "message": f"{key[0]} is not being watched"}))
+                    continue
+                self._clients[websocket] = key
+                await websocket.send(json.dumps(snapshot))
+        finally:
+            self._clients.pop(websocket, None)
+
+    def _snapshot(self, key, reset=False):
+        symbol, timeframe = key
+        with self._lock:
+            spec = self._watch.get(key)
+        if spec is None:
+            return None
+        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, spec["count"])
+        if rates is None or len(rates) == 0:
+            return None
+        tick = mt5.symbol_info_tick(symbol)
+        last = float(tick.bid) if tick else float(rates["close"][-1])
+        # start the push state from this snapshot unless other clients are already being
+        # fed from it; deltas are absolute values, so a client starting from newer data
+        # than the shared state simply receives a few redundant updates
+        if reset or key not in self._clients.values():
+            self._sent[key] = {
+                "time": int(rates["time"][-1]),
+                "candle": tuple(rates[-1][f] for f in CANDLE_FIELDS),
+                "last": last,
+                "levels": dict(spec["levels"]),
+            }
+        return {"type": "snapshot", "symbol": symbol, "candles": _candles(rates),
+                "last": last, "levels": spec["levels"]}
+
+    def _delta(self, key):
+        symbol, timeframe = key
+        with self._lock:
+            spec = self._watch.get(key)
+        sent = self._sent.get(key)
+        if spec is None or sent is None:
+            return None
+        delta = {}
+
+        # the forming candle and anything opened since the last push
+        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, 2)
+        if rates is not None and len(rates):
+            rates = rates[rates["time"] >= sent["time"]]
+            last_candle = tuple(rates[-1][f] for f in CANDLE_FIELDS) if len(rates) else None
+            if last_candle is not None and (len(rates) > 1 or last_candle != sent["candle"]):
+                delta["candles"] = _candles(rates)
+                sent["time"] = int(rates["time"][-1])
+                sent["candle"] = last_candle
+
+        tick = mt5.symbol_info_tick(symbol)
+        if tick and float(tick.bid) != sent["last"]:
+            delta["last"] = sent["last"] = float(tick.bid)
+
+        changed = {k: v for k, v in spec["levels"].items() if sent["levels"].get(k) != v}
+        removed = [k for k in sent["levels"] if k not in spec["levels"]]
+        if changed or removed:
+            delta["levels"] = changed
+            delta["removed"] = removed
+            sent["levels"] = dict(spec["levels"])
+
+        if not delta:
+            return None
+        delta["type"] = "delta"
+        return delta
+
+    def _poll(self):
+        with self._lock:
+            resnap, self._resnap = self._resnap, set()
+        for key in set(self._clients.values()):
+            # a new window size replaces the whole chart; otherwise only what changed
+            message = self._snapshot(key, reset=True) if key in resnap else self._delta(key)
+            if message is None:
+                continue
+            listeners = [ws for ws, k in self._clients.items() if k == key]
+            broadcast(listeners, json.dumps(message))
+
+
+# -----------------------
+# Browser side: Plotly.js chart fed by the WebSocket
+# -----------------------
+# The markup does not depend on prices, so Streamlit keeps the same iframe across reruns.
+STREAM_CHART_HTML = """
+<div id="chart" style="height:%(height)dpx;"></div>
+<script src="https://cdn.plot.ly/plotly-2.35.2.min.js"></script>
+<script>
+const symbol = %(symbol)s, timeframe = %(timeframe)s, title = %(title)s;
+const div = document.getElementById("chart");
+const colors = {Buy: ["green", "dash"], Resistance: ["orange", "dot"], Sell: ["red", "dash"]};
+let candles = null, levels = {}, last = null, windowSize = 0;
+
+const iso = t => new Date(t * 1000).toISOString();
+
+function shapes() {
+  const out = [];
+  for (const [name, y] of Object.entries(levels)) {
+    const prefix = Object.keys(colors).find(p => name.startsWith(p) && /\\d$/.test(name));
+    if (!prefix || (prefix === "Sell" && name !== "Sell1")) continue;
+    out.push({type: "line", xref: "paper", x0: 0, x1: 1, y0: y, y1: y,
+              line: {color: colors[prefix][0], dash: colors[prefix][1]}});
+  }
+  if (last !== null) out.push({type: "line", xref: "paper", x0: 0, x1: 1, y0: last, y1: last,
+                                line: {color: "blue", width: 2}});
+  return out;
+}
+
+function draw() {
+  const trace = {type: "candlestick", name: symbol, x: candles.time.map(iso),
+                 open: candles.open, high: candles.high, low: candles.low, close: candles.close};
+  Plotly.react(div, [trace], {title: title, height: %(height)d, shapes: shapes(),
+                              xaxis: {rangeslider: {visible: false}}, margin: {t: 40}});
+}
+
+function applyCandles(update) {
+  const fields = ["time", "open", "high", "low", "close"];
+  update.time.forEach((t, k) => {
+    const n = candles.time.length;
+    const at = n && t <= candles.time[n - 1] ? candles.time.lastIndexOf(t) : n;
+    if (at < 0) return;
+    for (const f of fields) candles[f][at] = update[f][k];
+  });
+  // keep the window the snapshot had
+  const extra = candles.time.length - windowSize;
+  if (extra > 0) for (const f of fields) candles[f].splice(0, extra);
+}
+
+function connect() {
+  const ws = new WebSocket("ws://%(host)s:%(port)d");
+  ws.onopen = () => ws.send(JSON.stringify({subscribe: symbol, timeframe: timeframe}));
+  ws.onmessage = ev => {
+    const msg = JSON.parse(ev.data);
+    if (msg.type === "snapshot") {
+      candles = msg.candles; levels = msg.levels; last = msg.last;
+      windowSize = candles.time.length;
+    } else if (msg.type === "delta" && candles) {
+      if (msg.candles) applyCandles(msg.candles);
+      if (msg.last !== undefined) last = msg.last;
+      if (msg.levels) Object.assign(levels, msg.levels);
+      (msg.removed || []).forEach(k => delete levels[k]);
+    } else {
+      return;
+    }
+    draw();
+  };
+  ws.onclose = () => setTimeout(connect, 2000);
+}
+connect();
+</script>
+"""
+
+
+def stream_chart_html(symbol, timeframe, title, host="localhost", port=8765, height=520):
+    return STREAM_CHART_HTML % {
+        "symbol": json.dumps(symbol), "timeframe": json.dumps(timeframe), "title": json.dumps(title),
+        "host": host, "port": port, "height": height,
+    }
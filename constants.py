@@ -0,0 +1,44 @@
+# constants.py
+# Imported modules run once per process, so everything here survives Streamlit reruns
+from functools import lru_cache
+
+import pytz
+
+# -------------------------------
+# Timezone options
+# -------------------------------
+TIMEZONES = {
+    "Karachi (UTC+5)": "Asia/Karachi",
+    "London (UTC+1 BST)": "Europe/London",
+    "New York (UTC-4 EDT)": "America/New_York"
+}
+TZ_OBJECTS = {label: pytz.timezone(name) for label, name in TIMEZONES.items()}
+KARACHI_TZ = TZ_OBJECTS["Karachi (UTC+5)"]
+
+# MT5 broker server clock: a zone name (DST followed per candle), a fixed offset in
+# seconds, or None to derive the current offset from a live tick
+SERVER_TIMEZONES = {
+    "Auto (from last tick)": None,
+    "UTC+2/+3, EU DST (EET)": "EET",
+    "London (GMT/BST)": "Europe/London",
+    "New York (EST/EDT)": "America/New_York",
+    "UTC": 0,
+}
+
+# -------------------------------
+# MT5 timeframes (labels shown in the UI)
+# -------------------------------
+TIMEFRAME_LABELS = ["1 Minute", "5 Minutes", "15 Minutes", "1 Hour", "4 Hours", "1 Day"]
+
+
+@lru_cache(maxsize=1)
+def timeframe_map():
+    import MetaTrader5 as mt5
+    return dict(zip(TIMEFRAME_LABELS, [
+        mt5.TIMEFRAME_M1,
+        mt5.TIMEFRAME_M5,
+        mt5.TIMEFRAME_M15,
+        mt5.TIMEFRAME_H1,
+        mt5.TIMEFRAME_H4,
+        mt5.TIMEFRAME_D1
+    ]))
@@ -0,0 +1,137 @@
+# journal.py
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytz
+import MetaTrader5 as mt5
+
+HISTORY_START = datetime(2000, 1, 1, tzinfo=pytz.UTC)
+# re-read a little before the high-water mark; duplicates are ignored by primary key
+SYNC_OVERLAP = timedelta(minutes=5)
+
+DEAL_COLUMNS = [
+    "ticket", "order", "position_id", "time_msc", "symbol", "type", "entry",
+    "magic", "volume", "price", "profit", "commission", "swap", "fee", "comment",
+]
+ORDER_COLUMNS = [
+    "ticket", "time_setup_msc", "time_done_msc", "symbol", "type", "state", "magic",
+    "position_id", "volume_initial", "price_open", "price_current", "comment",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deals (
+    ticket INTEGER PRIMARY KEY, order_ticket INTEGER, position_id INTEGER,
+    time_msc INTEGER, symbol TEXT, type INTEGER, entry INTEGER, magic INTEGER,
+    volume REAL, price REAL, profit REAL, commission REAL, swap REAL, fee REAL, comment TEXT
+);
+CREATE INDEX IF NOT EXISTS deals_symbol_time ON deals (symbol, time_msc);
+CREATE INDEX IF NOT EXISTS deals_order ON deals (order_ticket);
+CREATE TABLE IF NOT EXISTS orders (
+    ticket INTEGER PRIMARY KEY, time_setup_msc INTEGER, time_done_msc INTEGER,
+    symbol TEXT, type INTEGER, state INTEGER, magic INTEGER, position_id INTEGER,
+    volume_initial REAL, price_open REAL, price_current REAL, comment TEXT
+);
+CREATE INDEX IF NOT EXISTS orders_symbol_time ON orders (symbol, time_setup_msc);
+CREATE TABLE IF NOT EXISTS intents (
+    order_ticket INTEGER PRIMARY KEY, symbol TEXT, side TEXT,
+    level TEXT, level_price REAL, time_msc INTEGER
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+"""
+
+DEAL_TYPE_BUY, DEAL_TYPE_SELL = 0, 1   # mt5.DEAL_TYPE_BUY / DEAL_TYPE_SELL
+DEAL_ENTRY_IN = 0                      # mt5.DEAL_ENTRY_IN
+
+
+# -----------------------
+# Local trade journal (SQLite) synced from MT5 history
+# -----------------------
+class TradeJournal:
+    def __init__(self, path="journal.db"):
+        self.path = path
+        with closing(self._connect()) as con:
+            con.executescript(SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path)
+
+    def _get_mark(self, con, key):
+        row = con.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _sync_table(self, con, table, fetch, columns, time_field):
+        key = f"{table}_hwm_msc"
+        mark = self._get_mark(con, key)
+        if mark is None:
+            date_from = HISTORY_START
+        else:
+            date_from = datetime.fromtimestamp(mark / 1000, tz=pytz.UTC) - SYNC_OVERLAP
+        # MT5 history is in server time, so look a day ahead to not miss anything
+        date_to = datetime.now(pytz.UTC) + timedelta(days=1)
+        rows = fetch(date_from, date_to)
+        if not rows:
+            return 0
+        values = [tuple(getattr(r, c) for c in columns) for r in rows]
+        placeholders = ", ".join("?" * len(columns))
+        before = con.total_changes
+        con.executemany(f"INSERT OR IGNORE INTO {table} VALUES ({placeholders})", values)
+        inserted = con.total_changes - before
+        newest = max(getattr(r, time_field) for r in rows)
+        con.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, max(newest, mark or 0)))
+        return inserted
+
+    def sync(self):
+        # pull only what is newer than the stored high-water marks
+        with closing(self._connect()) as con, con:
+            deals = self._sync_table(con, "deals", mt5.history_deals_get, DEAL_COLUMNS, "time_msc")
+            orders = self._sync_table(con, "orders", mt5.history_orders_get, ORDER_COLUMNS, "time_setup_msc")
+        return {"deals": deals, "orders": orders}
+
+    def record_intent(self, order_ticket, symbol, side, level, level_price):
+        now_msc = int(datetime.now(pytz.UTC).timestamp() * 1000)
+        with closing(self._connect()) as con, con:
+            con.execute(
+                "INSERT OR REPLACE INTO intents VALUES (?, ?, ?, ?, ?, ?)",
+                (order_ticket, symbol, side, level, level_price, now_msc),
+            )
+
+    def deals_frame(self, magic=None):
+        query = "SELECT * FROM deals WHERE type IN (?, ?)"
+        params = [DEAL_TYPE_BUY, DEAL_TYPE_SELL]
+        if magic is not None:
+            query += " AND magic = ?"
+            params.append(magic)
+        with closing(self._connect()) as con:
+            df = pd.read_sql_query(query, con, params=params)
+            intents = pd.read_sql_query("SELECT order_ticket, level, level_price FROM intents", con)
+        return df.merge(intents, on="order_ticket", how="left")
+
+    def stats(self, magic=None):
+        # realised P&L, win rate and slippage vs the intended level, per symbol and day
+        df = self.deals_frame(magic)
+        if df.empty:
+            return df
+        df["day"] = pd.to_datetime(df["time_msc"], unit="ms").dt.date
+        df["net"] = df["profit"] + df["commission"] + df["swap"] + df["fee"]
+        closing_deal = df["entry"] != DEAL_ENTRY_IN
+        df["closed"] = closing_deal.astype(int)
+        df["won"] = (closing_deal & (df["net"] > 0)).astype(int)
+        # positive slippage = filled worse than the level we meant to trade
+        side = np.where(df["type"] == DEAL_TYPE_BUY, 1.0, -1.0)
+        df["slippage"] = np.where(
+            (df["entry"] == DEAL_ENTRY_IN) & df["level_price"].notna(),
+            (df["price"] - df["level_price"]) * side,
+            np.nan,
+        )
+        out = df.groupby(["symbol", "day"]).agg(
+            deals=("ticket", "size"),
+            realised_pnl=("net", "sum"),
+            closed_trades=("closed", "sum"),
+            wins=("won", "sum"),
+            avg_slippage=("slippage", "mean"),
+        ).reset_index()
+        out["win_rate"] = out["wins"] / out["closed_trades"].where(out["closed_trades"] > 0)
+        return out.drop(columns="wins").sort_values(["day", "symbol"], ascending=[False, True])
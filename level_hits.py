@@ -0,0 +1,136 @@
+# level_hits.py
+# Did price reach the levels saved by nasdaq.py?
+#   python level_hits.py dataset.csv candles.parquet [horizon_candles]
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from constants import KARACHI_TZ
+
+# levels below the entry price are reached from above (long), the rest from below (short)
+LEVEL_SIDES = {
+    "Buy1": "below", "Buy2": "below", "Buy3": "below",
+    "Resistance1": "above", "Resistance2": "above", "Resistance3": "above",
+    "Sell1": "above", "Sell2": "above", "Sell3": "above",
+}
+DEFAULT_HORIZON = 1440   # candles looked at after each journal row (one day of M1)
+CHUNK_ROWS = 2048        # bounds the rows x horizon window matrices
+
+
+def load_candles(path, utc_offset_hours=0):
+    # csv or parquet with time (epoch seconds or datetime), high, low
+    df = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+    if np.issubdtype(df["time"].dtype, np.number):
+        times = pd.to_datetime(df["time"], unit="s")
+    else:
+        times = pd.to_datetime(df["time"])
+    df = pd.DataFrame({
+        "time": times - pd.Timedelta(hours=utc_offset_hours),
+        "high": df["high"].astype(float),
+        "low": df["low"].astype(float),
+    })
+    return df.sort_values("time", ignore_index=True)
+
+
+def load_journal(path):
+    df = pd.read_csv(path, on_bad_lines="skip")
+    # DateTime is saved in Karachi time; candles are compared in naive UTC
+    df["time"] = (pd.to_datetime(df["DateTime"]).dt.tz_localize(KARACHI_TZ)
+                  .dt.tz_convert("UTC").dt.tz_localize(None))
+    return df
+
+
+def _windows(values, starts, horizon):
+    padded = np.concatenate([values, np.full(horizon, np.nan)])
+    return sliding_window_view(padded, horizon)[starts]
+
+
+def level_hits(journal, candles, horizon=DEFAULT_HORIZON):
+    # one row per (journal row, level): hit, minutes to hit, max adverse excursion after the hit
+    journal = journal.sort_values("time", ignore_index=True)
+    bars = candles[["time"]].assign(start=np.arange(len(candles)))
+    # as-of join: first candle at or after the moment the levels were saved
+    joined = pd.merge_asof(journal, bars, on="time", direction="forward")
+    joined = joined[joined["start"].notna()].reset_index(drop=True)
+    if joined.empty:
+        return pd.DataFrame()
+    joined["start"] = joined["start"].astype(np.int64)
+
+    highs = candles["high"].to_numpy()
+    lows = candles["low"].to_numpy()
+    bar_times = candles["time"].to_numpy()
+    frames = []
+
+    for lo in range(0, len(joined), CHUNK_ROWS):
+        chunk = joined.iloc[lo:lo + CHUNK_ROWS]
+        starts = chunk["start"].to_numpy()
+        win_high = _windows(highs, starts, horizon)
+        win_low = _windows(lows, starts, horizon)
+        # running extremes from the entry forward (fmin/fmax skip the NaN padding)
+        run_low = np.fmin.accumulate(win_low, axis=1)
+        run_high = np.fmax.accumulate(win_high, axis=1)
+        # extremes from each candle to the end of the horizon, for the excursion after the hit
+        tail_low = np.fmin.accumulate(win_low[:, ::-1], axis=1)[:, ::-1]
+        tail_high = np.fmax.accumulate(win_high[:, ::-1], axis=1)[:, ::-1]
+        rows = np.arange(len(chunk))
+
+        for level, side in LEVEL_SIDES.items():
+            if level not in chunk.columns:
+                continue
+            price = pd.to_numeric(chunk[level], errors="coerce").to_numpy()
+            valid = ~np.isnan(price)
+            if not valid.any():
+                continue
+            if side == "below":
+                reached = run_low <= price[:, None]
+            else:
+                reached = run_high >= price[:, None]
+            hit = reached[:, -1] & valid
+            first = np.where(hit, reached.argmax(axis=1), 0)
+            if side == "below":
+                mae = price - tail_low[rows, first]
+            else:
+                mae = tail_high[rows, first] - price
+            hit_time = bar_times[np.minimum(starts + first, len(bar_times) - 1)]
+            minutes = (hit_time - chunk["time"].to_numpy()) / np.timedelta64(1, "m")
+            frames.append(pd.DataFrame({
+                "DateTime": chunk["DateTime"].to_numpy()[valid],
+                "Session": chunk["Session"].to_numpy()[valid],
+                "Mode": chunk["Mode"].to_numpy()[valid],
+                "Level": level,
+                "Price": price[valid],
+                "Hit": hit[valid],
+                "MinutesToHit": np.where(hit, minutes, np.nan)[valid],
+                "MAE": np.where(hit, mae, np.nan)[valid],
+            }))
+
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def summarize(hits):
+    if hits.empty:
+        return hits
+    return hits.groupby(["Session", "Mode", "Level"]).agg(
+        Samples=("Hit", "size"),
+        HitRate=("Hit", "mean"),
+        MedianMinutesToHit=("MinutesToHit", "median"),
+        AvgMAE=("MAE", "mean"),
+        MaxMAE=("MAE", "max"),
+    ).reset_index()
+
+
+def main(argv):
+    if len(argv) < 2 or not all(os.path.exists(p) for p in argv[:2]):
+        print("usage: python level_hits.py dataset.csv candles.(csv|parquet) [horizon_candles]")
+        return 1
+    horizon = int(argv[2]) if len(argv) > 2 else DEFAULT_HORIZON
+    hits = level_hits(load_journal(argv[0]), load_candles(argv[1]), horizon)
+    print(summarize(hits).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
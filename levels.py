@@ -0,0 +1,60 @@
+# levels.py
+import numpy as np
+
+LEVEL_FACTOR = 1.4
+
+LEVEL_NAMES = [
+    "HH", "LL", "HL", "PHH", "PLL", "RLL",
+    "Buy1", "Buy2", "Buy3",
+    "Resistance1", "Resistance2", "Resistance3",
+    "Sell1", "Sell2", "Sell3",
+]
+
+
+# -----------------------
+# Levels straight from the copy_rates_* structured array (field views, no DataFrame)
+# -----------------------
+def compute_levels(rates, factor=LEVEL_FACTOR):
+    if rates is None or len(rates) == 0:
+        return None
+    highs = rates["high"]
+    lows = rates["low"]
+    n = len(rates)
+
+    HH = float(highs.max())
+    LL = float(lows.min())
+    HL = float(lows.max())
+    # partition instead of a full sort: only the top two of each side are needed
+    PHH = float(np.partition(highs, n - 2)[n - 2]) if n > 1 else None
+    PLL = float(np.partition(lows, 1)[1]) if n > 1 else None
+    RLL = LL
+
+    # buy/sell logic used previously
+    idm = (HH - LL) / 2
+    Buy1 = HH - (factor * idm)
+    Buy2 = Buy1 - (factor * idm)
+    Buy3 = Buy2 - (factor * idm)
+    Resistance1 = HH + (factor * idm)
+    Resistance2 = Resistance1 + (factor * idm)
+    Resistance3 = Resistance2 + (factor * idm)
+
+    # Sell levels (if PLL and RLL exist)
+    if (PLL is not None) and (RLL is not None):
+        dif_sell = PLL - RLL
+        Sell1 = HH + dif_sell
+        Sell2 = Sell1 + dif_sell
+        Sell3 = Sell2 + dif_sell
+    else:
+        Sell1 = Sell2 = Sell3 = None
+
+    return {
+        "HH": HH, "LL": LL, "HL": HL, "PHH": PHH, "PLL": PLL, "RLL": RLL,
+        "Buy1": Buy1, "Buy2": Buy2, "Buy3": Buy3,
+        "Resistance1": Resistance1, "Resistance2": Resistance2, "Resistance3": Resistance3,
+        "Sell1": Sell1, "Sell2": Sell2, "Sell3": Sell3
+    }
+
+
+def rate_times(rates):
+    # int64 epoch seconds reinterpreted as datetime64[s]: a view, nothing is copied
+    return rates["time"].view("datetime64[s]")
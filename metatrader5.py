@@ -1,6 +1,14 @@
-try:
+import importlib.util
+
+# Availability is checked without importing; the heavy modules load on first use
+MT5_AVAILABLE = importlib.util.find_spec("MetaTrader5") is not None
+
+
+def load_mt5():
     import MetaTrader5 as mt5
-    MT5_AVAILABLE = True
-except ImportError:
-    MT5_AVAILABLE = False
-import yfinance as yf
+    return mt5
+
+
+def load_yfinance():
+    import yfinance as yf
+    return yf
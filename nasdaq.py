@@ -3,10 +3,12 @@ import pandas as pd
 import os
 from datetime import datetime
 import pytz
+from sessions import primary_session
+from constants import KARACHI_TZ
 # CSV file path
 csv_file = "dataset.csv"
 
-karachi_tz = pytz.timezone("Asia/Karachi")
+karachi_tz = KARACHI_TZ
 # Columns for dataset
 columns = [
     "DateTime", "Session", "Mode", "HH", "LL", "PLL", "RLL",
@@ -23,13 +25,8 @@ if not os.path.exists(csv_file):
 
 # ---------- Helper: Detect Session ----------
 def detect_session():
-    now = datetime.now().hour
-    if 0 <= now < 8:
-        return "Asia"
-    elif 8 <= now < 16:
-        return "London"
-    else:
-        return "New York"
+    # DST-aware market sessions from UTC, not the local clock
+    return primary_session(datetime.now(pytz.UTC))
 
 
 # ---------- Sidebar Inputs ----------
@@ -109,7 +106,7 @@ if st.button("Calculate"):
 
 
 # ---------- Tabs ----------
-tab1, tab2 = st.tabs(["📊 Results", "📜 History"])
+tab1, tab2, tab3 = st.tabs(["📊 Results", "📜 History", "🎯 Level Hit Rates"])
 
 with tab1:
     if 'results_save' in locals():
@@ -169,6 +166,27 @@ with tab2:
     except Exception as e:
         st.error(f"Error reading history: {e}")
 
+with tab3:
+    st.caption("Checks whether price reached each saved level, using a local candle file (time, high, low).")
+    candle_file = st.text_input("Candle file (.csv or .parquet)", value="candles.csv")
+    horizon = st.number_input("Candles to look ahead", min_value=10, value=1440, step=10)
+    candle_offset = st.number_input("Candle time offset from UTC (hours)", min_value=-12, max_value=14, value=0, step=1)
+    if st.button("Run Hit-Rate Analysis"):
+        if not os.path.exists(candle_file):
+            st.error(f"Candle file not found: {candle_file}")
+        else:
+            from level_hits import level_hits, load_candles, load_journal, summarize
+            try:
+                hits = level_hits(load_journal(csv_file), load_candles(candle_file, candle_offset), int(horizon))
+                if hits.empty:
+                    st.info("No journal rows fall inside the candle file's time range.")
+                else:
+                    st.dataframe(summarize(hits).style.format(precision=2), use_container_width=True)
+                    with st.expander("Per-level detail"):
+                        st.dataframe(hits, use_container_width=True)
+            except Exception as e:
+                st.error(f"Error running analysis: {e}")
+
 # ---------- Fixed Bottom Footer ----------
 st.markdown(
     """
@@ -0,0 +1,175 @@
+# order_queue.py
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+
+import MetaTrader5 as mt5
+
+logger = logging.getLogger(__name__)
+
+# retcodes worth retrying with a fresh price
+RETRY_RETCODES = {
+    mt5.TRADE_RETCODE_REQUOTE,
+    mt5.TRADE_RETCODE_PRICE_CHANGED,
+    mt5.TRADE_RETCODE_PRICE_OFF,
+}
+FILLED_RETCODES = {
+    mt5.TRADE_RETCODE_DONE,
+    mt5.TRADE_RETCODE_PLACED,
+    mt5.TRADE_RETCODE_DONE_PARTIAL,
+}
+
+
+def build_request(symbol, lot, order_type, price, sl=0.0, tp_price=None):
+    return {
+        "action": mt5.TRADE_ACTION_DEAL,
+        "symbol": symbol,
+        "volume": lot,
+        "type": mt5.ORDER_TYPE_BUY if order_type == "BUY" else mt5.ORDER_TYPE_SELL,
+        "price": price,
+        "sl": sl,
+        "tp": tp_price if tp_price is not None else 0.0,
+        "deviation": 20,
+        "magic": 123456,
+        "comment": f"Streamlit Auto {order_type}",
+        "type_time": mt5.ORDER_TIME_GTC,
+        "type_filling": mt5.ORDER_FILLING_IOC
+    }
+
+
+# -----------------------
+# Order pipeline: queue -> worker -> order_check -> order_send (+ retries)
+# -----------------------
+class OrderExecutor:
+    def __init__(self, max_in_flight=1, max_retries=3, retry_delay=0.2, on_done=None):
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.on_done = on_done
+        self.orders = {}                      # id -> status dict (read by the UI)
+        self._queue = queue.Queue()
+        self._in_flight = defaultdict(int)    # symbol -> queued or executing orders
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._worker = threading.Thread(target=self._run, name="mt5-order-worker", daemon=True)
+        self._worker.start()
+
+    def submit(self, symbol, lot, order_type, sl_points=0, tp_price=None, intent=None):
+        status = {
+            "id": next(self._ids),
+            "symbol": symbol,
+            "side": order_type,
+            "volume": lot,
+            "tp": tp_price,
+            "state": "queued",
+            "retcode": None,
+            "message": "",
+            "attempts": 0,
+            "order": None,
+            "price": None,
+            "intent": intent,
+            "queued_at": time.time(),
+            "wait_ms": None,
+            "check_ms": 0.0,
+            "send_ms": 0.0,
+            "total_ms": None,
+        }
+        with self._lock:
+            self.orders[status["id"]] = status
+            if self._in_flight[symbol] >= self.max_in_flight:
+                status["state"] = "rejected"
+                status["message"] = f"{self._in_flight[symbol]} order(s) already in flight for {symbol}"
+                return status["id"]
+            self._in_flight[symbol] += 1
+        self._queue.put((status, sl_points))
+        return status["id"]
+
+    def in_flight(self, symbol):
+        with self._lock:
+            return self._in_flight[symbol]
+
+    def _run(self):
+        while True:
+            status, sl_points = self._queue.get()
+            started = time.time()
+            status["wait_ms"] = (started - status["queued_at"]) * 1000
+            try:
+                self._execute(status, sl_points)
+            except Exception as e:
+                status["state"] = "failed"
+                status["message"] = str(e)
+            finally:
+                status["total_ms"] = (time.time() - status["queued_at"]) * 1000
+                with self._lock:
+                    self._in_flight[status["symbol"]] -= 1
+                if self.on_done is not None:
+                    # a failing callback (e.g. a locked journal) must not kill the worker
+                    try:
+                        self.on_done(status)
+                    except Exception:
+                        logger.exception("on_done failed for order #%s", status["id"])
+
+    def _fail(self, status, message, retcode=None):
+        status["state"] = "failed"
+        status["message"] = message
+        status["retcode"] = retcode
+
+    def _execute(self, status, sl_points):
+        symbol = status["symbol"]
+        info = mt5.symbol_info(symbol)
+        if not info:
+            return self._fail(status, "Symbol info not available.")
+        # Safe check for trade permission
+        if not getattr(info, "trade_allowed", True):
+            status["state"] = "rejected"
+            status["message"] = f"Trading not allowed for {symbol}."
+            return
+
+        sl = 0.0
+        while status["attempts"] <= self.max_retries:
+            status["attempts"] += 1
+            status["state"] = "checking"
+            tick = mt5.symbol_info_tick(symbol)
+            if tick is None:
+                return self._fail(status, f"No tick for {symbol}: {mt5.last_error()}")
+            price = tick.ask if status["side"] == "BUY" else tick.bid
+            request = build_request(symbol, status["volume"], status["side"], price, sl, status["tp"])
+
+            t0 = time.perf_counter()
+            check = mt5.order_check(request)
+            status["check_ms"] += (time.perf_counter() - t0) * 1000
+            if check is None:
+                return self._fail(status, f"order_check failed: {mt5.last_error()}")
+            if check.retcode != 0:
+                if check.retcode in RETRY_RETCODES:
+                    time.sleep(self.retry_delay)
+                    continue
+                return self._fail(status, f"order_check: {check.comment}", check.retcode)
+
+            status["state"] = "sending"
+            t0 = time.perf_counter()
+            result = mt5.order_send(request)
+            status["send_ms"] += (time.perf_counter() - t0) * 1000
+            if result is None:
+                return self._fail(status, f"order_send failed: {mt5.last_error()}")
+            status["retcode"] = result.retcode
+            status["message"] = result.comment
+            if result.retcode in FILLED_RETCODES:
+                status["state"] = "filled"
+                status["order"] = result.order
+                status["price"] = result.price
+                return
+            if result.retcode not in RETRY_RETCODES:
+                return self._fail(status, result.comment, result.retcode)
+            status["state"] = "retrying"
+            time.sleep(self.retry_delay)
+
+        self._fail(status, f"gave up after {status['attempts']} attempts: {status['message']}", status["retcode"])
+
+    def statuses(self, ids=None):
+        with self._lock:
+            rows = list(self.orders.values()) if ids is None else [self.orders[i] for i in ids if i in self.orders]
+        return sorted((dict(r) for r in rows), key=lambda r: r["id"], reverse=True)
@@ -0,0 +1,86 @@
+# portfolio.py
+import pandas as pd
+
+POSITION_TYPE_BUY = 0  # mt5.POSITION_TYPE_BUY
+
+AGG_FIELDS = ("positions", "net_volume", "exposure", "profit")
+
+
+def _contribution(p):
+    sign = 1.0 if p.type == POSITION_TYPE_BUY else -1.0
+    return (1, sign * p.volume, sign * p.volume * p.price_current, p.profit)
+
+
+# -----------------------
+# Positions tracked by ticket, aggregates updated by diff
+# -----------------------
+class PositionBook:
+    def __init__(self):
+        self.positions = {}   # ticket -> TradePosition
+        self.by_symbol = {}   # symbol -> [positions, net_volume, exposure, profit]
+        self.by_magic = {}    # magic -> [positions, net_volume, exposure, profit]
+
+    def __len__(self):
+        return len(self.positions)
+
+    @staticmethod
+    def _apply(table, key, values, sign):
+        row = table.setdefault(key, [0, 0.0, 0.0, 0.0])
+        for k, v in enumerate(values):
+            row[k] += sign * v
+        if row[0] == 0:
+            del table[key]
+
+    def _add(self, p, sign):
+        values = _contribution(p)
+        self._apply(self.by_symbol, p.symbol, values, sign)
+        self._apply(self.by_magic, p.magic, values, sign)
+
+    def sync(self, positions):
+        # diff a positions_get() snapshot against the book; only changed tickets touch the aggregates
+        if positions is None:
+            # positions_get() failed (terminal disconnected): keep the book instead of closing everything
+            return {"opened": [], "closed": [], "modified": []}
+        snapshot = {p.ticket: p for p in positions}
+        opened, modified = [], []
+        for ticket, p in snapshot.items():
+            old = self.positions.get(ticket)
+            if old is None:
+                opened.append(p)
+            elif old != p:
+                modified.append((old, p))
+        closed = [p for ticket, p in self.positions.items() if ticket not in snapshot]
+
+        for p in closed:
+            self._add(p, -1)
+        for old, p in modified:
+            self._add(old, -1)
+            self._add(p, 1)
+        for p in opened:
+            self._add(p, 1)
+        self.positions = snapshot
+        return {"opened": opened, "closed": closed, "modified": [p for _, p in modified]}
+
+    @property
+    def floating_profit(self):
+        return sum(row[3] for row in self.by_symbol.values())
+
+    def magic_totals(self, magic):
+        return dict(zip(AGG_FIELDS, self.by_magic.get(magic, [0, 0.0, 0.0, 0.0])))
+
+    @staticmethod
+    def _frame(table, index_name):
+        df = pd.DataFrame.from_dict(table, orient="index", columns=list(AGG_FIELDS))
+        df.index.name = index_name
+        return df.reset_index()
+
+    def symbol_frame(self):
+        return self._frame(self.by_symbol, "symbol")
+
+    def magic_frame(self):
+        return self._frame(self.by_magic, "magic")
+
+    def positions_frame(self):
+        if not self.positions:
+            return pd.DataFrame()
+        return pd.DataFrame([p._asdict() for p in self.positions.values()])
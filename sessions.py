@@ -0,0 +1,167 @@
+# sessions.py
+from datetime import datetime, timedelta, time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import pytz
+
+# -------------------------------
+# Sessions in their own market time, so DST shifts are applied per date
+# (summer UTC: Asia 00-09, London 07-16, New York 12-21)
+# -------------------------------
+SESSIONS = {
+    "Asia": {"tz": pytz.timezone("Asia/Tokyo"), "start": time(9, 0), "end": time(18, 0)},
+    "London": {"tz": pytz.timezone("Europe/London"), "start": time(8, 0), "end": time(17, 0)},
+    "New York": {"tz": pytz.timezone("America/New_York"), "start": time(8, 0), "end": time(17, 0)},
+}
+SESSION_NAMES = list(SESSIONS.keys())
+SESSION_BITS = {name: 1 << k for k, name in enumerate(SESSION_NAMES)}
+
+DAY = 86400
+
+
+# -------------------------------
+# One calendar per day, shared by every caller in the process
+# -------------------------------
+@lru_cache(maxsize=64)
+def session_calendar(day):
+    calendar = {}
+    for name, sess in SESSIONS.items():
+        tz = sess["tz"]
+        start = tz.localize(datetime.combine(day, sess["start"])).astimezone(pytz.UTC)
+        end = tz.localize(datetime.combine(day, sess["end"])).astimezone(pytz.UTC)
+        # handle overnight session crossing midnight
+        if end <= start:
+            end += timedelta(days=1)
+        calendar[name] = (start, end)
+    return calendar
+
+
+@lru_cache(maxsize=16)
+def _bounds(name, first_day, last_day):
+    # epoch-second start/end arrays for one session over a range of day numbers
+    days = range(first_day, last_day + 1)
+    cal = [session_calendar(datetime.fromtimestamp(d * DAY, tz=pytz.UTC).date())[name] for d in days]
+    starts = np.array([int(s.timestamp()) for s, _ in cal], dtype=np.int64)
+    ends = np.array([int(e.timestamp()) for _, e in cal], dtype=np.int64)
+    return starts, ends
+
+
+def active_sessions(now_utc):
+    calendar = session_calendar(now_utc.date())
+    return [name for name, (start, end) in calendar.items() if start <= now_utc < end]
+
+
+def primary_session(now_utc):
+    # most recently opened session today (so the evening after NY close is still "New York")
+    calendar = session_calendar(now_utc.date())
+    started = [(start, name) for name, (start, _) in calendar.items() if start <= now_utc]
+    return max(started)[1] if started else SESSION_NAMES[0]
+
+
+# -------------------------------
+# Broker server clock -> UTC
+# -------------------------------
+def server_offsets(times, server_tz=None):
+    # UTC offset (seconds) of MT5 server-clock epoch times. server_tz is a fixed offset in
+    # seconds, or a zone name so the broker's own DST switch lands on the right candles
+    if server_tz is None:
+        return 0
+    if isinstance(server_tz, (int, np.integer)):
+        return int(server_tz)
+    wall = pd.to_datetime(np.asarray(times, dtype=np.int64), unit="s")
+    # the repeated hour when the server clock falls back is read as standard time
+    utc = wall.tz_localize(server_tz, ambiguous=np.zeros(len(wall), dtype=bool),
+                           nonexistent="shift_forward").tz_convert(None)
+    return ((wall - utc) // pd.Timedelta(seconds=1)).to_numpy(np.int64)
+
+
+def offset_from_clock(server_epoch, utc_epoch, max_skew=120):
+    # server offset implied by a fresh tick (tick.time is server clock), rounded to 30 min;
+    # None when the tick is too old to tell (market closed)
+    diff = server_epoch - utc_epoch
+    offset = int(round(diff / 1800)) * 1800
+    return offset if abs(diff - offset) <= max_skew else None
+
+
+# -------------------------------
+# Vectorized candle tagging
+# -------------------------------
+def session_index(times, name, server_tz=None):
+    # times: epoch seconds on the MT5 server clock (see server_offsets for server_tz)
+    # returns the session-open epoch each candle belongs to, 0 when outside the session
+    t = np.asarray(times, dtype=np.int64)
+    t = t - server_offsets(t, server_tz)
+    if t.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    starts, ends = _bounds(name, int(t.min() // DAY) - 1, int(t.max() // DAY) + 1)
+    idx = np.searchsorted(starts, t, side="right") - 1
+    inside = (idx >= 0) & (t < ends[np.clip(idx, 0, None)])
+    return np.where(inside, starts[np.clip(idx, 0, None)], 0)
+
+
+def tag_sessions(times, server_tz=None):
+    # bitmask per candle; overlaps (London/New York) set several bits
+    mask = np.zeros(len(times), dtype=np.uint8)
+    for name, bit in SESSION_BITS.items():
+        mask |= np.where(session_index(times, name, server_tz) > 0, bit, 0).astype(np.uint8)
+    return mask
+
+
+def latest_session_rates(rates, name, server_tz=None):
+    # candles of the most recent (possibly still running) occurrence of a session
+    ids = session_index(rates["time"], name, server_tz)
+    if not ids.any():
+        return rates[:0]
+    return rates[ids == ids.max()]
+
+
+# -------------------------------
+# Incremental per-session open / HH / LL
+# -------------------------------
+class SessionTracker:
+    def __init__(self, server_tz=None, max_entries=300):
+        self.server_tz = server_tz
+        self.max_entries = max_entries
+        self.last_time = None
+        self.stats = {}  # (session, session_open_epoch) -> {"open", "HH", "LL"}
+
+    def update(self, rates):
+        # the last known candle is re-read because it may still be forming; max/min make that safe
+        if self.last_time is not None:
+            rates = rates[rates["time"] >= self.last_time]
+        if len(rates) == 0:
+            return
+        for name in SESSION_NAMES:
+            ids = session_index(rates["time"], name, self.server_tz)
+            sel = ids > 0
+            if not sel.any():
+                continue
+            ids, highs, lows, opens = ids[sel], rates["high"][sel], rates["low"][sel], rates["open"][sel]
+            # candles are time ordered, so each session occurrence is one contiguous run
+            cuts = np.flatnonzero(np.diff(ids)) + 1
+            firsts = np.concatenate(([0], cuts))
+            run_high = np.maximum.reduceat(highs, firsts)
+            run_low = np.minimum.reduceat(lows, firsts)
+            for k, first in enumerate(firsts):
+                key = (name, int(ids[first]))
+                entry = self.stats.get(key)
+                if entry is None:
+                    self.stats[key] = {"open": float(opens[first]), "HH": float(run_high[k]),
+                                       "LL": float(run_low[k])}
+                else:
+                    entry["HH"] = max(entry["HH"], float(run_high[k]))
+                    entry["LL"] = min(entry["LL"], float(run_low[k]))
+        self.last_time = int(rates["time"][-1])
+        if len(self.stats) > self.max_entries:
+            for key in sorted(self.stats, key=lambda k: k[1])[:len(self.stats) - self.max_entries]:
+                del self.stats[key]
+
+    def latest(self, name):
+        keys = [k for k in self.stats if k[0] == name]
+        if not keys:
+            return None
+        key = max(keys)
+        start = datetime.fromtimestamp(key[1], tz=pytz.UTC)
+        return dict(self.stats[key], session=name, start=start)
@@ -0,0 +1,110 @@
+# snapshot.py
+import glob
+import os
+import threading
+from datetime import datetime
+
+import pyarrow as pa
+import pytz
+
+# One row per published value; the schema never changes so consumers can rely on it
+SNAPSHOT_SCHEMA = pa.schema([
+    pa.field("seq", pa.uint64(), nullable=False),
+    pa.field("written_at", pa.timestamp("ms", tz="UTC"), nullable=False),
+    pa.field("symbol", pa.string(), nullable=False),
+    pa.field("source", pa.string(), nullable=False),   # levels / swept / broken / signal
+    pa.field("name", pa.string(), nullable=False),
+    pa.field("value", pa.float64()),
+    pa.field("text", pa.string()),
+])
+
+LATEST_POINTER = "LATEST"
+
+
+def value_rows(symbol, source, values):
+    # flatten a result dict: numbers -> value, strings -> text, lists -> "Name 1..n"
+    rows = []
+    for name, v in values.items():
+        if isinstance(v, (list, tuple)):
+            rows.extend(value_rows(symbol, source, {f"{name} {k}": x for k, x in enumerate(v, 1)}))
+        elif isinstance(v, str):
+            rows.append((symbol, source, name, None, v))
+        else:
+            rows.append((symbol, source, name, None if v is None else float(v), None))
+    return rows
+
+
+# -----------------------
+# Arrow IPC snapshot writer
+# -----------------------
+class SnapshotWriter:
+    # Each publish() writes snapshot-<seq>.arrow (uncompressed Arrow IPC file, so a
+    # reader can memory-map it without parsing or copying) and then swaps the LATEST
+    # pointer. Files are never rewritten in place, which also keeps Windows readers
+    # that still have an older snapshot mapped from blocking the writer.
+
+    def __init__(self, directory="snapshots", keep=5):
+        self.directory = directory
+        self.keep = keep
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        latest = read_pointer(directory)
+        self.seq = latest[0] if latest else 0
+
+    def publish(self, rows):
+        with self._lock:
+            self.seq += 1
+            seq = self.seq
+            n = len(rows)
+            symbols, sources, names, values, texts = (list(col) for col in zip(*rows)) if rows else ([],) * 5
+            table = pa.table({
+                "seq": pa.array([seq] * n, pa.uint64()),
+                "written_at": pa.array([datetime.now(pytz.UTC)] * n, pa.timestamp("ms", tz="UTC")),
+                "symbol": pa.array(symbols, pa.string()),
+                "source": pa.array(sources, pa.string()),
+                "name": pa.array(names, pa.string()),
+                "value": pa.array(values, pa.float64()),
+                "text": pa.array(texts, pa.string()),
+            }, schema=SNAPSHOT_SCHEMA.with_metadata({"seq": str(seq)}))
+
+            filename = f"snapshot-{seq:012d}.arrow"
+            path = os.path.join(self.directory, filename)
+            with pa.OSFile(path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+            pointer = os.path.join(self.directory, LATEST_POINTER)
+            with open(pointer + ".tmp", "w") as f:
+                f.write(f"{seq} {filename}\n")
+            os.replace(pointer + ".tmp", pointer)
+            self._prune()
+            return seq
+
+    def _prune(self):
+        files = sorted(glob.glob(os.path.join(self.directory, "snapshot-*.arrow")))
+        for path in files[:-self.keep]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # still mapped by a reader; retried on the next publish
+
+
+# -----------------------
+# Consumer side
+# -----------------------
+def read_pointer(directory):
+    try:
+        with open(os.path.join(directory, LATEST_POINTER)) as f:
+            seq, filename = f.read().split()
+    except (OSError, ValueError):
+        return None
+    return int(seq), os.path.join(directory, filename)
+
+
+def read_latest(directory="snapshots"):
+    # memory-mapped, zero-copy table of the newest snapshot (None if nothing published yet)
+    latest = read_pointer(directory)
+    if latest is None:
+        return None
+    source = pa.memory_map(latest[1], "r")
+    return pa.ipc.open_file(source).read_all()
@@ -0,0 +1,55 @@
+# startup_profile.py
+# Import-time breakdown for the dashboards' dependencies:
+#   python startup_profile.py                 # default module list
+#   python startup_profile.py plotly.graph_objects pandas
+import subprocess
+import sys
+
+DEFAULT_MODULES = [
+    "streamlit", "pandas", "numpy", "pytz", "requests", "pyarrow",
+    "plotly.graph_objects", "streamlit_autorefresh", "MetaTrader5", "yfinance",
+]
+
+
+def import_profile(module, skip=()):
+    # cumulative microseconds per imported package, from python -X importtime
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}" if module else "pass"],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return None, {}
+    rows = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if not parts[1].isdigit():
+            continue  # header line
+        name = parts[2].strip()
+        top = name.split(".")[0]
+        if top not in skip:
+            rows[top] = max(rows.get(top, 0), int(parts[1]))
+    if not module:
+        return None, rows
+    total = rows.get(module.split(".")[0], max(rows.values(), default=0))
+    return total, rows
+
+
+def main(modules):
+    # whatever the interpreter already imports at startup is not the app's cost
+    _, startup = import_profile(None)
+    print(f"{'module':<24}{'cumulative ms':>14}   biggest dependencies")
+    for module in modules:
+        total, rows = import_profile(module, skip=set(startup))
+        if total is None:
+            print(f"{module:<24}{'not installed':>14}")
+            continue
+        top = module.split(".")[0]
+        deps = sorted(((us, name) for name, us in rows.items() if name != top), reverse=True)[:4]
+        deps_text = ", ".join(f"{name} {us / 1000:.0f}" for us, name in deps)
+        print(f"{module:<24}{total / 1000:>14.1f}   {deps_text}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_MODULES)
@@ -0,0 +1,223 @@
+# tick_recorder.py
+import os
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytz
+import MetaTrader5 as mt5
+
+# -----------------------
+# Compact tick layout (40 bytes per tick)
+# -----------------------
+TICK_DTYPE = np.dtype([
+    ("time_msc", "<i8"),
+    ("bid", "<f8"),
+    ("ask", "<f8"),
+    ("last", "<f8"),
+    ("volume", "<f4"),
+    ("flags", "<u4"),
+])
+
+# header: ring geometry + write cursor, persisted next to the data file
+HEADER_DTYPE = np.dtype([
+    ("capacity", "<i8"),
+    ("segment", "<i8"),
+    ("written", "<i8"),
+    ("flushed", "<i8"),
+    ("last_msc", "<i8"),
+])
+
+DEFAULT_CAPACITY = 1 << 20   # ~40 MB per symbol
+DEFAULT_SEGMENT = 1 << 16    # ticks per Parquet file
+
+
+def to_tick_array(ticks):
+    # convert an MT5 tick array (or a single symbol_info_tick) to TICK_DTYPE
+    if not isinstance(ticks, np.ndarray):
+        ticks = ticks._asdict()
+        ticks = {k: np.array([v]) for k, v in ticks.items()}
+        fields = ticks.keys()
+    else:
+        fields = ticks.dtype.names
+    out = np.empty(len(ticks["time_msc"]), dtype=TICK_DTYPE)
+    for name in ("time_msc", "bid", "ask", "last", "flags"):
+        out[name] = ticks[name]
+    out["volume"] = ticks["volume_real"] if "volume_real" in fields else ticks["volume"]
+    return out
+
+
+# -----------------------
+# Fixed-size memory-mapped ring per symbol
+# -----------------------
+class TickRing:
+    def __init__(self, path, capacity=DEFAULT_CAPACITY, segment=DEFAULT_SEGMENT):
+        if capacity % segment != 0:
+            raise ValueError("capacity must be a multiple of segment")
+        data_path = path + ".ticks"
+        header_path = path + ".hdr"
+        if os.path.exists(data_path) and os.path.exists(header_path):
+            self.header = np.memmap(header_path, dtype=HEADER_DTYPE, mode="r+", shape=(1,))
+            capacity = int(self.header["capacity"][0])
+            segment = int(self.header["segment"][0])
+            self.data = np.memmap(data_path, dtype=TICK_DTYPE, mode="r+", shape=(capacity,))
+        else:
+            self.header = np.memmap(header_path, dtype=HEADER_DTYPE, mode="w+", shape=(1,))
+            self.header["capacity"] = capacity
+            self.header["segment"] = segment
+            self.data = np.memmap(data_path, dtype=TICK_DTYPE, mode="w+", shape=(capacity,))
+        self.capacity = capacity
+        self.segment = segment
+
+    @property
+    def written(self):
+        return int(self.header["written"][0])
+
+    @property
+    def last_msc(self):
+        return int(self.header["last_msc"][0])
+
+    def __len__(self):
+        return min(self.written, self.capacity)
+
+    def append(self, ticks, on_segment=None):
+        # ticks must be TICK_DTYPE and time-ordered; writes stop at every segment
+        # boundary so a closed segment is handed to on_segment before it is overwritten
+        pos = 0
+        while pos < len(ticks):
+            written = self.written
+            slot = written % self.capacity
+            room = self.segment - (slot % self.segment)
+            n = min(room, len(ticks) - pos)
+            self.data[slot:slot + n] = ticks[pos:pos + n]
+            pos += n
+            self.header["written"] = written + n
+            if n == room:
+                start = slot + n - self.segment
+                if on_segment is not None:
+                    on_segment(self.data[start:start + self.segment])
+                self.header["flushed"] = written + n
+        if len(ticks):
+            self.header["last_msc"] = ticks["time_msc"][-1]
+        self.header.flush()
+
+    def count_at_last(self, window=1024):
+        # ticks stored at last_msc (several ticks can share one millisecond)
+        tail = self.recent(window)["time_msc"]
+        return len(tail) - int(np.searchsorted(tail, self.last_msc, side="left"))
+
+    def open_segment(self):
+        # ticks written since the last closed segment (a view)
+        flushed = int(self.header["flushed"][0])
+        slot = flushed % self.capacity
+        return self.data[slot:slot + (self.written - flushed)]
+
+    def _span(self, start, stop):
+        # absolute write positions [start, stop), oldest first; a view unless it wraps the ring
+        n = stop - start
+        slot = start % self.capacity
+        if slot + n <= self.capacity:
+            return self.data[slot:slot + n]
+        return np.concatenate([self.data[slot:], self.data[:slot + n - self.capacity]])
+
+    def recent(self, n=None):
+        # last n ticks
+        written = self.written
+        count = min(written, self.capacity)
+        n = count if n is None else min(n, count)
+        return self._span(written - n, written)
+
+    def after(self, count):
+        # ticks written after write position `count` and the position to resume from;
+        # only the new tail is touched (ticks the ring already overwrote are skipped)
+        written = self.written
+        start = min(max(count, written - self.capacity), written)
+        return self._span(start, written), written
+
+    def flush(self):
+        self.data.flush()
+        self.header.flush()
+
+
+# -----------------------
+# Recorder: MT5 -> rings -> Parquet
+# -----------------------
+class TickRecorder:
+    def __init__(self, root="ticks", capacity=DEFAULT_CAPACITY, segment=DEFAULT_SEGMENT,
+                 lookback_seconds=300, max_batch=100000):
+        self.root = root
+        self.capacity = capacity
+        self.segment = segment
+        self.lookback_seconds = lookback_seconds
+        self.max_batch = max_batch
+        self.rings = {}
+        # shared by every Streamlit session: read cursor -> fetch -> append must not interleave
+        self._lock = threading.RLock()
+        os.makedirs(root, exist_ok=True)
+
+    def ring(self, symbol):
+        with self._lock:
+            ring = self.rings.get(symbol)
+            if ring is None:
+                sym_dir = os.path.join(self.root, symbol)
+                os.makedirs(sym_dir, exist_ok=True)
+                ring = TickRing(os.path.join(sym_dir, symbol), self.capacity, self.segment)
+                self.rings[symbol] = ring
+            return ring
+
+    def _rollover(self, symbol, segment):
+        first = int(segment["time_msc"][0])
+        last = int(segment["time_msc"][-1])
+        path = os.path.join(self.root, symbol, f"{symbol}_{first}_{last}.parquet")
+        pd.DataFrame(segment).to_parquet(path, index=False)
+
+    def poll_symbol(self, symbol):
+        with self._lock:
+            return self._poll_symbol(symbol)
+
+    def _poll_symbol(self, symbol):
+        ring = self.ring(symbol)
+        last = ring.last_msc
+        if last:
+            date_from = datetime.fromtimestamp(last / 1000, tz=pytz.UTC)
+        else:
+            date_from = datetime.now(pytz.UTC) - timedelta(seconds=self.lookback_seconds)
+        ticks = mt5.copy_ticks_from(symbol, date_from, self.max_batch, mt5.COPY_TICKS_ALL)
+        if ticks is None or len(ticks) == 0:
+            tick = mt5.symbol_info_tick(symbol)
+            if tick is None:
+                return 0
+            ticks = to_tick_array(tick)
+        else:
+            ticks = to_tick_array(ticks)
+        # copy_ticks_from is inclusive at second resolution; drop what we already have,
+        # keeping ticks that share the last stored millisecond beyond those already stored
+        keep = ticks["time_msc"] > last
+        if last:
+            same = np.flatnonzero(ticks["time_msc"] == last)
+            keep[same[ring.count_at_last():]] = True
+        ticks = ticks[keep]
+        ring.append(ticks, on_segment=lambda seg: self._rollover(symbol, seg))
+        return len(ticks)
+
+    def poll(self, symbols):
+        return {symbol: self.poll_symbol(symbol) for symbol in symbols}
+
+    def recent(self, symbol, n=None):
+        return self.ring(symbol).recent(n)
+
+    def history(self, symbol):
+        # closed Parquet segments followed by the ticks still in the open segment
+        sym_dir = os.path.join(self.root, symbol)
+        files = sorted(
+            (f for f in os.listdir(sym_dir) if f.endswith(".parquet")),
+            key=lambda f: int(f.rsplit("_", 2)[1]),
+        ) if os.path.isdir(sym_dir) else []
+        frames = [pd.read_parquet(os.path.join(sym_dir, f)) for f in files]
+        frames.append(pd.DataFrame(self.ring(symbol).open_segment()))
+        return pd.concat(frames, ignore_index=True)
+
+    def flush(self):
+        for ring in self.rings.values():
+            ring.flush()